@@ -1,4 +1,3 @@
-import copy
 import pprint
 import warnings
 from collections import namedtuple
@@ -7,6 +6,13 @@ import numpy as np
 
 from .core import CallbackBase, CollectThenCompute
 
+_STATS_FIELDS = ("min", "max", "com", "cen", "crossings", "fwhm", "lin_bkg")
+Stats = namedtuple("Stats", _STATS_FIELDS, defaults=(None,) * len(_STATS_FIELDS))
+# Derivative stats also carry the derivative data they were computed from.
+DerivativeStats = namedtuple(
+    "DerivativeStats", _STATS_FIELDS + ("x", "y"), defaults=(None,) * (len(_STATS_FIELDS) + 2)
+)
+
 
 class LiveFit(CallbackBase):
     """
@@ -26,30 +32,65 @@ class LiveFit(CallbackBase):
     update_every : int or None, optional
         How often to recompute the fit. If `None`, do not compute until the
         end. Default is 1 (recompute after each new point).
+    warm_start : bool, optional
+        If True, once a fit with more points than parameters has succeeded,
+        subsequent fits in the same run start from the previous best-fit
+        parameters rather than from ``init_guess``. This usually converges in
+        fewer iterations, but a poor early fit can trap later ones in the
+        same local minimum. Default is False.
+    method : string, optional
+        Minimization method passed through to ``lmfit.Model.fit``. Default is
+        ``'leastsq'`` (Levenberg-Marquardt), which is a good choice for models
+        with few parameters. For models with many parameters (roughly 20 or
+        more) ``'lbfgsb'`` can be much faster, because its per-iteration cost
+        grows linearly with the number of parameters instead of requiring
+        the full Jacobian.
 
     Attributes
     ----------
     result : lmfit.ModelResult
     """
 
-    def __init__(self, model, y, independent_vars, init_guess=None, *, update_every=1):
-        self.ydata = []
-        self.independent_vars_data = {}
+    _INITIAL_CAPACITY = 16
+
+    def __init__(
+        self,
+        model,
+        y,
+        independent_vars,
+        init_guess=None,
+        *,
+        update_every=1,
+        warm_start=False,
+        method="leastsq",
+    ):
         self.__stale = False
         self.result = None
         self._model = model
+        # The model cannot be replaced, so count its parameters once.
+        self._n_params = len(model.param_names)
         self.y = y
         self.independent_vars = independent_vars
         if init_guess is None:
             init_guess = {}
         self.init_guess = init_guess
         self.update_every = update_every
+        self.warm_start = warm_start
+        self.method = method
 
     @property
     def model(self):
         # Make this a property so it can't be updated.
         return self._model
 
+    @property
+    def ydata(self):
+        return self._ybuf[: self._n]
+
+    @property
+    def independent_vars_data(self):
+        return {k: buf[: self._n] for k, buf in self._iv_bufs.items()}
+
     @property
     def independent_vars(self):
         return self._independent_vars
@@ -63,35 +104,38 @@ class LiveFit(CallbackBase):
                 )
             )
         self._independent_vars = val
-        self.independent_vars_data.clear()
-        self.independent_vars_data.update({k: [] for k in val})
+        self._iv_keys = tuple(val)
+        self._iv_fields = tuple(val.values())
         self._reset()
 
     def _reset(self):
         self.result = None
         self.__stale = False
-        self.ydata.clear()
-        for v in self.independent_vars_data.values():
-            v.clear()
+        # Data are cached in preallocated arrays which grow by doubling, so
+        # that each refit sees an ndarray view rather than a fresh copy.
+        # Allocate new buffers rather than rewinding the old ones: results and
+        # ydata views from a previous run still reference them.
+        self._n = 0
+        self._ybuf = np.empty(self._INITIAL_CAPACITY, dtype=np.float64)
+        self._iv_bufs = {k: np.empty(self._INITIAL_CAPACITY, dtype=np.float64) for k in self._independent_vars}
 
     def start(self, doc):
         self._reset()
         super().start(doc)
 
     def event(self, doc):
-        if self.y not in doc["data"]:
+        data = doc["data"]
+        if self.y not in data:
             return
-        y = doc["data"][self.y]
-        idv = {k: doc["data"][v] for k, v in self.independent_vars.items()}
 
         # Always stash the data for the next time the fit is updated.
-        self.update_caches(y, idv)
+        self._ingest(doc)
         self.__stale = True
 
         # Maybe update the fit or maybe wait.
         if self.update_every is not None:
-            i = len(self.ydata)
-            N = len(self.model.param_names)
+            i = self._n
+            N = self._n_params
             if i < N:
                 # not enough points to fit yet
                 pass
@@ -105,14 +149,34 @@ class LiveFit(CallbackBase):
             self.update_fit()
         super().stop(doc)
 
+    def _grow_caches(self):
+        size = 2 * self._ybuf.size
+        self._ybuf = np.resize(self._ybuf, size)
+        for k, buf in self._iv_bufs.items():
+            self._iv_bufs[k] = np.resize(buf, size)
+
+    def _ingest(self, doc):
+        # This runs at detector rate, so read the fields straight from the
+        # Event rather than building a dict for update_caches.
+        data = doc["data"]
+        self._append(data[self.y], (data[field] for field in self._iv_fields))
+
     def update_caches(self, y, independent_vars):
-        self.ydata.append(y)
-        for k, v in self.independent_vars_data.items():
-            v.append(independent_vars[k])
+        self._append(y, (independent_vars[k] for k in self._iv_keys))
+
+    def _append(self, y, independent_values):
+        "Write one point; independent_values are in the order of _iv_keys."
+        n = self._n
+        if n == self._ybuf.size:
+            self._grow_caches()
+        self._ybuf[n] = y
+        for k, v in zip(self._iv_keys, independent_values):
+            self._iv_bufs[k][n] = v
+        self._n = n + 1
 
     def update_fit(self):
-        N = len(self.model.param_names)
-        if len(self.ydata) < N:
+        N = self._n_params
+        if self._n < N:
             warnings.warn(
                 f"LiveFitPlot cannot update fit until there are at least {N} data points",
                 stacklevel=1,
@@ -120,8 +184,15 @@ class LiveFit(CallbackBase):
         else:
             kwargs = {}
             kwargs.update(self.independent_vars_data)
-            kwargs.update(self.init_guess)
-            self.result = self.model.fit(self.ydata, **kwargs)
+            if self.warm_start and self.result is not None and self.result.success and self.result.nfree > 0:
+                # Warm-start from the previous fit, which is usually close to
+                # the new optimum and so converges in far fewer iterations.
+                # A fit with no free degrees of freedom (as many points as
+                # parameters) is not trustworthy enough to start from.
+                kwargs["params"] = self.result.params
+            else:
+                kwargs.update(self.init_guess)
+            self.result = self.model.fit(self.ydata, method=self.method, **kwargs)
             self.__stale = False
 
 
@@ -176,6 +247,28 @@ def center_of_mass(input, labels=None, index=None):
     return [tuple(v) for v in np.array(results).T]
 
 
+def _com_1d(y):
+    "Center of mass of a 1-D array, in index units; a fast path for center_of_mass."
+    return (np.arange(y.shape[0], dtype=float) @ y) / y.sum()
+
+
+def _index_to_x(x, idx):
+    """
+    Map a fractional index into x by linear interpolation between neighbours.
+
+    Equivalent to ``np.interp(idx, np.arange(len(x)), x)``, including clamping
+    to the ends, without allocating the index array or searching it.
+    """
+    if np.isnan(idx):
+        return np.float64(np.nan)
+    if idx <= 0:
+        return x[0]
+    if idx >= len(x) - 1:
+        return x[-1]
+    i0 = int(idx)
+    return x[i0] + (idx - i0) * (x[i0 + 1] - x[i0])
+
+
 class PeakStats(CollectThenCompute):
     """
     Compute peak statsitics after a run finishes.
@@ -197,7 +290,8 @@ class PeakStats(CollectThenCompute):
     Notes
     -----
     It is assumed that the two fields, x and y, are recorded in the same
-    Event stream.
+    Event stream. The readings are stored as float64 arrays in ``x_data``
+    and ``y_data``, so integer readings are reported as floats.
 
     Attributes
     ----------
@@ -229,6 +323,9 @@ class PeakStats(CollectThenCompute):
         "lin_bkg",
     )
 
+    _STAT_KEYS = _STATS_FIELDS
+    _ITEM_KEYS = frozenset(("x", "y", "stats", "derivative_stats") + _STATS_FIELDS)
+
     def __init__(self, x, y, *, edge_count=None, calc_derivative_and_stats=False):
         self.x = x
         self.y = y
@@ -237,25 +334,16 @@ class PeakStats(CollectThenCompute):
         self.stats = None
         self.derivative_stats = None
 
-        self._stats_fields = {
-            "min": None,
-            "max": None,
-            "com": None,
-            "cen": None,
-            "crossings": None,
-            "fwhm": None,
-            "lin_bkg": None,
-        }
-        for field, value in self._stats_fields.items():
-            setattr(self, field, value)
+        for field in self._STAT_KEYS:
+            setattr(self, field, None)
 
         super().__init__()
 
     def __getitem__(self, key):
-        if key in ["x", "y", "stats", "derivative_stats"] + list(self._stats_fields.keys()):
+        if key in self._ITEM_KEYS:
             return getattr(self, key)
         else:
-            raise KeyError
+            raise KeyError(key)
 
     def __dict__(self):
         return_dict = {}
@@ -272,7 +360,8 @@ class PeakStats(CollectThenCompute):
 
     @staticmethod
     def _calc_stats(x, y, fields, edge_count=None):
-        y_orig = np.copy(y)
+        # y is rebound, never modified in place, so no copy is needed.
+        y_orig = y
         if edge_count is not None:
             left_x = np.mean(x[:edge_count])
             left_y = np.mean(y[:edge_count])
@@ -282,45 +371,59 @@ class PeakStats(CollectThenCompute):
 
             m = (right_y - left_y) / (right_x - left_x)
             b = left_y - m * left_x
-            y = y - (m * x + b)
+            # Subtract the background using a single temporary.
+            background = np.multiply(x, m)
+            background += b
+            y = np.subtract(y, background, out=background)
             fields["lin_bkg"] = {"m": m, "b": b}
 
         argmin_y = np.argmin(y)
         argmax_y = np.argmax(y)
+        # Reuse the extrema found above rather than scanning y again.
+        min_y = y[argmin_y]
+        max_y = y[argmax_y]
 
         fields["min"] = (x[argmin_y], y_orig[argmin_y])
         fields["max"] = (x[argmax_y], y_orig[argmax_y])
-        (fields["com"],) = np.interp(center_of_mass(y), np.arange(len(x)), x)
-        mid = (np.max(y) + np.min(y)) / 2
-        crossings = np.where(np.diff((y > mid).astype(int)))[0]
-        _cen_list = []
-        for cr in crossings.ravel():
-            _x = x[cr : cr + 2]
-            _y = y[cr : cr + 2] - mid
-
-            dx = np.diff(_x)[0]
-            dy = np.diff(_y)[0]
-            m = dy / dx
-            _cen_list.append((-_y[0] / m) + _x[0])
-
-        if _cen_list:
-            fields["cen"] = np.mean(_cen_list)
-            fields["crossings"] = np.array(_cen_list)
-            if len(_cen_list) >= 2:
-                fields["fwhm"] = np.abs(fields["crossings"][-1] - fields["crossings"][0], dtype=float)
-
-        Stats = namedtuple("Stats", field_names=fields.keys())
+        if max_y == min_y:
+            # A flat signal has its center of mass in the middle, which is
+            # taken directly rather than dividing by a possibly zero sum, and
+            # it never crosses its mid-line.
+            fields["com"] = _index_to_x(x, (len(y) - 1) / 2)
+            return Stats(**fields)
+        fields["com"] = _index_to_x(x, _com_1d(y))
+        mid = (max_y + min_y) / 2
+        # Compare neighbouring booleans directly; np.diff would widen to int.
+        above = y > mid
+        crossings = np.flatnonzero(above[1:] ^ above[:-1])
+        # Linearly interpolate the mid-line crossing between each pair of
+        # points that straddle it, for all crossings at once.
+        x0 = x[crossings]
+        y0 = y[crossings] - mid
+        slope = ((y[crossings + 1] - mid) - y0) / (x[crossings + 1] - x0)
+        cens = x0 - y0 / slope
+
+        if len(cens):
+            fields["cen"] = np.mean(cens)
+            fields["crossings"] = cens
+            if len(cens) >= 2:
+                fields["fwhm"] = abs(float(cens[-1] - cens[0]))
+
         stats = Stats(**fields)
         return stats
 
     def compute(self):
         "This method is called at run-stop time by the superclass."
         # clear all results
-        for field, value in self._stats_fields.items():
-            setattr(self, field, value)
-
-        x = []
-        y = []
+        for field in self._STAT_KEYS:
+            setattr(self, field, None)
+
+        # Fill preallocated arrays; events lacking either field are skipped,
+        # so trim to the number actually filled.
+        n = len(self._events)
+        x = np.empty(n)
+        y = np.empty(n)
+        k = 0
         for event in self._events:
             try:
                 _x = event["data"][self.x]
@@ -328,10 +431,11 @@ class PeakStats(CollectThenCompute):
             except KeyError:
                 pass
             else:
-                x.append(_x)
-                y.append(_y)
-        x = np.array(x)
-        y = np.array(y)
+                x[k] = _x
+                y[k] = _y
+                k += 1
+        x = x[:k]
+        y = y[:k]
 
         if not len(x):
             # nothing to do
@@ -339,20 +443,19 @@ class PeakStats(CollectThenCompute):
         self.x_data = x
         self.y_data = y
 
-        stats_fields = copy.deepcopy(self._stats_fields)
-        self.stats = self._calc_stats(x, y, stats_fields, edge_count=self._edge_count)
+        self.stats = self._run_stats(x, y)
 
-        for field in self._stats_fields:
+        for field in self._STAT_KEYS:
             setattr(self, field, getattr(self.stats, field))
 
-        if self._calc_derivative_and_stats:
-            # Calculate the derivative stats of the data
+        if self._calc_derivative_and_stats and len(x) > 1:
+            # Calculate the derivative stats of the data. y_der is returned to
+            # the user as derivative_stats.y, so it must be a fresh array each
+            # run rather than a reused scratch buffer.
             x_der = x[1:]
             y_der = np.diff(y)
+            self.derivative_stats = DerivativeStats(*self._run_stats(x_der, y_der), x=x_der, y=y_der)
 
-            stats_fields = copy.deepcopy(self._stats_fields)
-            stats_fields.update({"x": x_der, "y": y_der})
-            self.derivative_stats = self._calc_stats(x_der, y_der, stats_fields, edge_count=self._edge_count)
-
-        # reset y data
-        y = self.y_data
+    def _run_stats(self, x, y):
+        "Compute a Stats for one pair of x, y arrays."
+        return self._calc_stats(x, y, dict.fromkeys(self._STAT_KEYS), edge_count=self._edge_count)
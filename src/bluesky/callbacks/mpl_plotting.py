@@ -645,6 +645,9 @@ class LiveFitPlot(LivePlot):
         super().start(doc)
         self.livefit.start(doc)
         (self.x,) = self.livefit.independent_vars.keys()  # in case it changed
+        # Take the guess from init_guess, not result.init_values, which hold
+        # the previous fit's values when the LiveFit warm-starts.
+        self._guess_values = self.livefit.model.make_params(**self.livefit.init_guess).valuesdict()
         if self._has_been_run:
             label = "_nolegend_"
         else:
@@ -672,7 +675,7 @@ class LiveFitPlot(LivePlot):
             self.y_data = self.livefit.result.model.eval(**kwargs)
             self.x_data = x_points
             # update kwargs to inital guess
-            kwargs.update(self.livefit.result.init_values)
+            kwargs.update(self._guess_values)
             self.y_guess = self.livefit.result.model.eval(**kwargs)
             self.update_plot()
         # Intentionally override LivePlot.event. Do not call super().
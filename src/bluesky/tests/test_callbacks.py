@@ -276,6 +276,67 @@ def test_live_fit(RE, hw):
         assert np.allclose(cb.result.values[k], v, atol=1e-6)
 
 
+def _gaussian_live_fit(**kwargs):
+    "Make a LiveFit of a 1D Gaussian to hw.det against hw.motor."
+    lmfit = pytest.importorskip("lmfit")
+
+    def gaussian(x, A, sigma, x0):
+        return A * np.exp(-((x - x0) ** 2) / (2 * sigma**2))
+
+    model = lmfit.Model(gaussian)
+    init_guess = {"A": 2, "sigma": lmfit.Parameter("sigma", 3, min=0), "x0": -0.2}
+    return LiveFit(model, "det", {"x": "motor"}, init_guess, **kwargs)
+
+
+def _assert_gaussian_fit(result, atol=1e-6):
+    "Check a fit by _gaussian_live_fit recovered the parameters of hw.det."
+    expected = {"A": 1, "sigma": 1, "x0": 0}
+    for k, v in expected.items():
+        assert np.allclose(result.values[k], v, atol=atol)
+
+
+def test_live_fit_warm_start(RE, hw):
+    cb = _gaussian_live_fit(update_every=1, warm_start=True)
+    results = []
+    update_fit = cb.update_fit
+
+    def recording_update_fit():
+        update_fit()
+        results.append(cb.result)
+
+    cb.update_fit = recording_update_fit
+    RE(scan([hw.det], hw.motor, -1, 1, 50), cb)
+
+    _assert_gaussian_fit(cb.result)
+    # The last fit started from the previous fit's result.
+    assert results[-1] is cb.result
+    assert cb.result.init_values["A"] == results[-2].params["A"].value
+
+
+def test_live_fit_keeps_previous_results(RE, hw):
+    cb = _gaussian_live_fit(update_every=None)
+    RE(scan([hw.det], hw.motor, -1, 1, 5), cb)
+    result = cb.result
+    ydata = cb.ydata
+    data = result.data.copy()
+    x = result.userkws["x"].copy()
+
+    RE(scan([hw.det], hw.motor, 0, 2, 5), cb)
+
+    assert cb.result is not result
+    assert np.array_equal(result.data, data)
+    assert np.array_equal(result.userkws["x"], x)
+    assert np.array_equal(ydata, data)
+
+
+def test_live_fit_method(RE, hw):
+    cb = _gaussian_live_fit(update_every=50, method="lbfgsb")
+    RE(scan([hw.det], hw.motor, -1, 1, 50), cb)
+
+    assert cb.result.method == "L-BFGS-B"
+    _assert_gaussian_fit(cb.result, atol=1e-3)
+
+
 def test_live_fit_multidim(RE, hw):
     try:
         import lmfit
@@ -335,6 +396,20 @@ def test_live_fit_plot(RE, hw):
         assert np.allclose(livefit.result.values[k], v, atol=1e-6)
 
 
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_live_fit_plot_init_guess(RE, hw, warm_start):
+    livefit = _gaussian_live_fit(update_every=1, warm_start=warm_start)
+    lfplot = LiveFitPlot(livefit, ax=plt.gca())
+    RE(scan([hw.det], hw.motor, -1, 1, 20), lfplot)
+
+    # The grey line always shows init_guess, even after warm-started refits.
+    x, y_guess = lfplot.init_guess_line.get_data()
+    expected = livefit.model.eval(x=x, A=2, sigma=3, x0=-0.2)
+    assert np.allclose(y_guess, expected)
+    if not warm_start:
+        assert livefit.result.init_values == {"A": 2, "sigma": 3, "x0": -0.2}
+
+
 @pytest.mark.parametrize("int_meth, stop_num, msg_num", [("stop", 1, 5), ("abort", 1, 5), ("halt", 1, 3)])
 def test_interrupted_with_callbacks(RE, int_meth, stop_num, msg_num):
     docs = defaultdict(list)
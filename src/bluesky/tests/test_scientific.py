@@ -1,8 +1,10 @@
+import warnings
+
 import numpy as np
 import pytest
 from ophyd.sim import SynGauss, det, motor
 
-from bluesky.callbacks.fitting import PeakStats
+from bluesky.callbacks.fitting import PeakStats, _com_1d, _index_to_x, center_of_mass
 from bluesky.plans import scan
 
 
@@ -77,6 +79,7 @@ def test_peak_statistics(RE):
     np.allclose(ps.com, 0, atol=1e-6)
     fwhm_gauss = 2 * np.sqrt(2 * np.log(2))  # theoretical value with std=1
     assert np.allclose(ps.fwhm, fwhm_gauss, atol=1e-2)
+    assert type(ps.fwhm) is float  # noqa: E721
 
 
 def test_peak_statistics_compare_chx(RE):
@@ -134,3 +137,77 @@ def test_peak_statistics_with_derivatives(RE):
     assert len(ps.derivative_stats.x) == num_points - 1
     assert len(ps.derivative_stats.y) == num_points - 1
     assert np.allclose(np.diff(ps.y_data), ps.derivative_stats.y, atol=1e-10)
+
+
+def test_com_1d_matches_center_of_mass():
+    y = np.random.RandomState(0).rand(101)
+    (expected,) = center_of_mass(y)
+    assert np.isclose(_com_1d(y), expected)
+
+
+def test_peak_statistics_edge_count():
+    x = np.linspace(-5, 5, 101)
+    y = np.exp(-(x**2) / 2) + 0.1 * x + 2
+    fields = dict.fromkeys(PeakStats._STAT_KEYS)
+    stats = PeakStats._calc_stats(x, y, fields, edge_count=3)
+
+    assert np.isclose(stats.lin_bkg["m"], 0.1, atol=1e-3)
+    assert np.isclose(stats.cen, 0, atol=1e-6)
+    # min/max report the original readings, not the background-subtracted ones
+    assert stats.max == (x[50], y[50])
+
+
+@pytest.mark.parametrize("idx", [-1.5, 0, 0.25, 3.0, 7.6, 9, 12.0, np.nan])
+def test_index_to_x(idx):
+    x = np.array([0.0, 1.0, 3.0, 4.0, 4.5, 6.0, 7.0, 9.0, 10.0, 13.0])
+    assert np.allclose(_index_to_x(x, idx), np.interp(idx, np.arange(len(x)), x), equal_nan=True)
+
+
+def test_peak_statistics_getitem(RE):
+    ps = PeakStats("motor", "det")
+    RE.subscribe(ps)
+    RE(scan([det], motor, -5, 5, 21))
+
+    assert ps["cen"] == ps.cen
+    assert ps["stats"] is ps.stats
+    with pytest.raises(KeyError):
+        ps["x_data"]
+
+
+@pytest.mark.parametrize("value", [0.0, 3.0])
+def test_peak_statistics_flat(value):
+    x = np.linspace(-5, 5, 11)
+    y = np.full_like(x, value)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        stats = PeakStats._calc_stats(x, y, dict.fromkeys(PeakStats._STAT_KEYS))
+
+    assert stats.min == (x[0], value)
+    assert stats.max == (x[0], value)
+    assert stats.com == 0
+    assert stats.cen is None
+    assert stats.crossings is None
+    assert stats.fwhm is None
+
+
+def test_peak_statistics_with_derivatives_single_point(RE):
+    ps = PeakStats("motor", "det", calc_derivative_and_stats=True)
+    RE.subscribe(ps)
+    RE(scan([det], motor, 0, 0, 1))
+
+    assert ps.stats is not None
+    assert ps.derivative_stats is None
+
+
+def test_peak_statistics_integer_readings():
+    ps = PeakStats("motor", "det")
+    ps("start", {"uid": "start"})
+    for i, (m, d) in enumerate(zip(range(-2, 3), [0, 1, 4, 1, 0])):
+        ps("event", {"uid": f"event{i}", "data": {"motor": m, "det": d}})
+    ps("stop", {"uid": "stop"})
+
+    # Integer readings are stored, and reported, as float64.
+    assert ps.x_data.dtype == np.float64
+    assert ps.y_data.dtype == np.float64
+    assert ps.max == (0.0, 4.0)
+    assert type(ps.max[0]) is np.float64